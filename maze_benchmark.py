@@ -0,0 +1,47 @@
+import argparse
+import time
+from maze_generator import generate_maze, GENERATORS, SIZE_CAPS
+
+def benchmark(algorithms=None, sizes=(1000, 2000, 5000, 10000), seed=0, size_caps=SIZE_CAPS, extra_paths_ratio=0.15):
+    """Time each generation algorithm on square mazes
+    
+    Runs the app's default configuration, extra-paths pass included; pass
+    extra_paths_ratio=0 to time the carve alone.
+    
+    Args:
+        algorithms: Names from GENERATORS (defaults to all of them)
+        sizes: Maze side lengths to try
+        seed: Random seed, the same for every run
+        size_caps: Largest size to run per algorithm, larger ones are skipped
+            with a note (pass {} to run everything)
+        extra_paths_ratio: Ratio of walls removed for multiple solutions (0 turns it off)
+    
+    Returns:
+        List of (algorithm, size, elapsed_time, cells_per_second)
+    """
+    results = []
+    print(f"Extra paths ratio {extra_paths_ratio}" + (" (carve only)" if not extra_paths_ratio else ""))
+    for algorithm in algorithms or list(GENERATORS):
+        for size in sizes:
+            if size > size_caps.get(algorithm, size):
+                print(f"{algorithm:>12} | {size:>5}x{size:<5} | skipped, above its {size_caps[algorithm]} cap "
+                      f"(use --no-caps to run it)")
+                continue
+            start_time = time.time()
+            generate_maze(size, size, seed, bool(extra_paths_ratio), extra_paths_ratio, algorithm=algorithm)
+            elapsed_time = time.time() - start_time
+            results.append((algorithm, size, elapsed_time, size * size / elapsed_time))
+            print(f"{algorithm:>12} | {size:>5}x{size:<5} | {elapsed_time:9.3f}s | "
+                  f"{size * size / elapsed_time:>14,.0f} cells/s")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark maze generation algorithms")
+    parser.add_argument('--algorithms', nargs='+', choices=list(GENERATORS), default=None)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 2000, 5000, 10000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--extra-paths', type=float, default=0.15,
+                        help="Extra paths ratio as in the app, 0 times the carve alone")
+    parser.add_argument('--no-caps', action='store_true', help="Run every algorithm at every size, however slow")
+    args = parser.parse_args()
+    benchmark(args.algorithms, args.sizes, args.seed, {} if args.no_caps else SIZE_CAPS, args.extra_paths)
@@ -0,0 +1,175 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+import time
+import numpy as np
+from maze_generator import generate_maze, GENERATORS
+from maze_solverbfs import bfs_solve
+
+def shard_seeds(seed, num_shards, shard_size):
+    """Per-maze seeds for every shard
+
+    Each shard draws from its own child of one SeedSequence, so a shard's mazes
+    depend only on (seed, shard index, shard size), never on worker count or
+    completion order.
+
+    Returns:
+        List of uint32 arrays, one per shard
+    """
+    children = np.random.SeedSequence(seed).spawn(num_shards)
+    return [child.generate_state(shard_size) for child in children]
+
+
+def _write_shard(out_dir, shard, seeds, width, height, multiple_solutions, extra_paths_ratio, solve, algorithm):
+    """Generate one shard and write it to disk (runs in a worker process)"""
+    count = len(seeds)
+    mazes = np.zeros((count, height, (width + 7) // 8), dtype=np.uint8)
+    starts = np.zeros((count, 2), dtype=np.int32)
+    ends = np.zeros((count, 2), dtype=np.int32)
+    arrays = {}
+
+    if solve:
+        path_lengths = np.full(count, -1, dtype=np.int32)
+        path_chunks = []
+
+    for i, maze_seed in enumerate(seeds):
+        maze, start, end = generate_maze(width, height, int(maze_seed), multiple_solutions, extra_paths_ratio,
+                                         algorithm=algorithm)
+        # Walls packed 8 per byte along each row
+        mazes[i] = np.packbits(maze == 1, axis=1)
+        starts[i], ends[i] = start, end
+
+        if solve:
+            result = bfs_solve(maze, start, end, return_visited=True)
+            if result.path_index is not None:
+                path_lengths[i] = len(result.path_index)
+                path_chunks.append(result.path_index)
+
+    if solve:
+        # Ragged BFS paths stored as one flat-index array plus lengths
+        arrays['path_lengths'] = path_lengths
+        arrays['paths'] = np.concatenate(path_chunks) if path_chunks else np.zeros(0, dtype=np.int32)
+
+    filename = f'shard-{shard:05d}.npz'
+    tmp_path = os.path.join(out_dir, filename + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, mazes=mazes, width=width, seeds=seeds, starts=starts, ends=ends, **arrays)
+    os.replace(tmp_path, os.path.join(out_dir, filename))
+    return shard, count, filename
+
+
+def load_shard(path):
+    """Read a shard written by generate_dataset
+
+    Returns:
+        Dict with 'mazes' unpacked to a (count, height, width) uint8 array of
+        0 (path) / 1 (wall), plus 'seeds', 'starts', 'ends' and, for solved
+        datasets, 'paths' as a list of int32 flat-index arrays (None if unsolvable)
+    """
+    with np.load(path) as data:
+        width = int(data['width'])
+        shard = {
+            'mazes': np.unpackbits(data['mazes'], axis=2, count=width),
+            'seeds': data['seeds'],
+            'starts': data['starts'],
+            'ends': data['ends'],
+        }
+        if 'path_lengths' in data:
+            lengths = data['path_lengths']
+            offsets = np.concatenate([[0], np.cumsum(np.maximum(lengths, 0))])
+            paths = data['paths']
+            shard['paths'] = [paths[offsets[i]:offsets[i + 1]] if n >= 0 else None
+                              for i, n in enumerate(lengths)]
+    return shard
+
+
+def generate_dataset(out_dir, count, width=20, height=20, seed=0, shard_size=1000, workers=None,
+                     solve=False, multiple_solutions=True, extra_paths_ratio=0.15, algorithm='backtracker',
+                     verbose=True):
+    """Generate a maze corpus in parallel, streaming shards to disk as they finish
+
+    Args:
+        out_dir: Directory for shard-NNNNN.npz files and manifest.json
+        count: Number of mazes
+        width: Width of each maze
+        height: Height of each maze
+        seed: Base seed for the whole corpus
+        shard_size: Mazes per shard file
+        workers: Worker processes (defaults to CPU count)
+        solve: If True, also store BFS shortest paths
+        multiple_solutions: Passed to generate_maze
+        extra_paths_ratio: Passed to generate_maze
+        algorithm: Passed to generate_maze
+        verbose: Print throughput as shards complete
+
+    Returns:
+        Manifest dict, including elapsed_time and mazes_per_second
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    start_time = time.time()
+
+    num_shards = -(-count // shard_size)
+    seeds = shard_seeds(seed, num_shards, shard_size)
+    if num_shards:
+        # Last shard only holds the remainder
+        seeds[-1] = seeds[-1][:count - shard_size * (num_shards - 1)]
+
+    shards = [None] * num_shards
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_write_shard, out_dir, i, seeds[i], width, height,
+                               multiple_solutions, extra_paths_ratio, solve, algorithm)
+                   for i in range(num_shards)]
+        for future in as_completed(futures):
+            shard, shard_count, filename = future.result()
+            shards[shard] = filename
+            done += shard_count
+            if verbose:
+                elapsed = time.time() - start_time
+                print(f"{done}/{count} mazes | {done / elapsed:.1f} mazes/s | {filename}")
+
+    elapsed_time = time.time() - start_time
+    manifest = {
+        'count': count,
+        'width': width,
+        'height': height,
+        'seed': seed,
+        'shard_size': shard_size,
+        'solve': solve,
+        'multiple_solutions': multiple_solutions,
+        'extra_paths_ratio': extra_paths_ratio,
+        'algorithm': algorithm,
+        'shards': shards,
+        'elapsed_time': elapsed_time,
+        'mazes_per_second': count / elapsed_time if elapsed_time > 0 else 0.0,
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a sharded maze dataset")
+    parser.add_argument('out_dir', help="Output directory")
+    parser.add_argument('--count', type=int, default=1000, help="Number of mazes")
+    parser.add_argument('--width', type=int, default=20)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0, help="Base seed for the corpus")
+    parser.add_argument('--shard-size', type=int, default=1000, help="Mazes per shard file")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--solve', action='store_true', help="Store BFS shortest paths")
+    parser.add_argument('--single-solution', action='store_true', help="Don't add extra paths")
+    parser.add_argument('--extra-paths-ratio', type=float, default=0.15)
+    parser.add_argument('--algorithm', choices=list(GENERATORS), default='backtracker')
+    args = parser.parse_args(argv)
+
+    manifest = generate_dataset(
+        args.out_dir, args.count, args.width, args.height, args.seed, args.shard_size,
+        args.workers, args.solve, not args.single_solution, args.extra_paths_ratio, args.algorithm)
+    print(f"Generated {manifest['count']} mazes in {manifest['elapsed_time']:.2f}s "
+          f"({manifest['mazes_per_second']:.1f} mazes/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+from array import array
+from collections import deque
+import json
+import numpy as np
+import time
+
+def bfs_distance_field(maze, source):
+    """Compute BFS distances from one cell to every cell of the maze
+
+    Args:
+        maze: The maze array (0 = path, 1 = wall)
+        source: Source position tuple (y, x)
+
+    Returns:
+        uint32 array shaped like the maze; unreachable cells and walls
+        hold the uint32 maximum
+    """
+    height, width = maze.shape
+    unreachable = np.iinfo(np.uint32).max
+
+    # Pad with a wall border so flat neighbours never need a bounds check
+    padded_width = width + 2
+    passable = np.pad(maze == 0, 1, constant_values=False).ravel().tobytes()
+    dist = array('I', bytes(4 * len(passable)))
+    seen = bytearray(len(passable))
+
+    # 4 directions in flat padded indices: up, right, down, left
+    offsets = (-padded_width, 1, padded_width, -1)
+
+    src = (source[0] + 1) * padded_width + source[1] + 1
+    if passable[src]:
+        seen[src] = 1
+        queue = deque([src])
+        while queue:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if passable[neighbor] and not seen[neighbor]:
+                    seen[neighbor] = 1
+                    dist[neighbor] = next_dist
+                    queue.append(neighbor)
+
+    field = np.frombuffer(dist, dtype=np.uint32).reshape(height + 2, padded_width)
+    reached = np.frombuffer(seen, dtype=np.uint8).reshape(height + 2, padded_width)
+    field = np.where(reached != 0, field, unreachable).astype(np.uint32)
+    return field[1:-1, 1:-1].copy()
+
+
+def _junction_cells(maze):
+    """Path cells with 3 or more open neighbours"""
+    open_cells = np.pad(maze == 0, 1, constant_values=False)
+    neighbors = (open_cells[:-2, 1:-1].astype(np.uint8) + open_cells[2:, 1:-1]
+                 + open_cells[1:-1, :-2] + open_cells[1:-1, 2:])
+    return (maze == 0) & (neighbors >= 3)
+
+
+class DistanceOracle:
+    """Precomputed BFS distance fields from a set of landmark cells
+
+    The first landmarks are the exits the oracle was built for and give exact
+    distances. Extra landmarks (picked among junction cells) tighten the
+    triangle-inequality bounds returned for arbitrary cell pairs.
+    """
+
+    def __init__(self, landmarks, fields, build_time=0.0):
+        # landmarks: (k, 3) int32 array of (y, x, is_exit)
+        # fields: (k, height, width) uint16/uint32 distances
+        self.landmarks = landmarks
+        self.fields = fields
+        self.build_time = build_time
+        self.unreachable = np.iinfo(fields.dtype).max
+        self._index = {(int(y), int(x)): i for i, (y, x, _) in enumerate(landmarks)}
+        self._exit_rows = np.flatnonzero(landmarks[:, 2])
+
+    @classmethod
+    def build(cls, maze, exits, num_landmarks=0):
+        """Build an oracle for a maze
+
+        Args:
+            maze: The maze array
+            exits: Iterable of position tuples answered exactly
+            num_landmarks: Extra landmarks chosen as the junction cells farthest
+                from every landmark already picked
+
+        Returns:
+            DistanceOracle
+        """
+        start_time = time.time()
+
+        cells = list(dict.fromkeys(tuple(int(v) for v in cell) for cell in exits))
+        is_exit = [1] * len(cells)
+        fields = [bfs_distance_field(maze, cell) for cell in cells]
+
+        if num_landmarks > 0:
+            candidates = _junction_cells(maze)
+            if not candidates.any():
+                candidates = maze == 0
+            # Distance from each cell to its nearest landmark so far (farthest-point sampling)
+            nearest = np.minimum.reduce(fields) if fields else np.full(maze.shape, np.iinfo(np.uint32).max, np.uint32)
+            for _ in range(num_landmarks):
+                score = np.where(candidates & (nearest != np.iinfo(np.uint32).max), nearest, 0)
+                if not score.any():
+                    break
+                cell = np.unravel_index(int(np.argmax(score)), maze.shape)
+                cell = (int(cell[0]), int(cell[1]))
+                field = bfs_distance_field(maze, cell)
+                cells.append(cell)
+                is_exit.append(0)
+                fields.append(field)
+                nearest = np.minimum(nearest, field)
+
+        stacked = np.stack(fields) if fields else np.empty((0,) + maze.shape, np.uint32)
+
+        # Store in uint16 whenever every finite distance fits
+        finite = stacked[stacked != np.iinfo(np.uint32).max]
+        if finite.size == 0 or finite.max() < np.iinfo(np.uint16).max:
+            stacked = np.where(stacked == np.iinfo(np.uint32).max,
+                               np.iinfo(np.uint16).max, stacked).astype(np.uint16)
+
+        landmarks = np.array([(y, x, e) for (y, x), e in zip(cells, is_exit)],
+                             dtype=np.int32).reshape(-1, 3)
+        return cls(landmarks, stacked, time.time() - start_time)
+
+    @property
+    def nbytes(self):
+        """Memory footprint of the stored distance data in bytes"""
+        return self.fields.nbytes + self.landmarks.nbytes
+
+    def _value(self, row, cell):
+        d = int(self.fields[row, cell[0], cell[1]])
+        return None if d == self.unreachable else d
+
+    def distance_to(self, cell, landmark):
+        """Exact distance from cell to a landmark cell, or None if unreachable"""
+        return self._value(self._index[tuple(landmark)], cell)
+
+    def nearest_exit(self, cell):
+        """Closest exit to cell as (exit, distance), or (None, None) if none is reachable"""
+        if len(self._exit_rows) == 0:
+            return None, None
+        dists = self.fields[self._exit_rows, cell[0], cell[1]]
+        best = int(np.argmin(dists))
+        if int(dists[best]) == self.unreachable:
+            return None, None
+        y, x, _ = self.landmarks[self._exit_rows[best]]
+        return (int(y), int(x)), int(dists[best])
+
+    def bounds(self, a, b):
+        """Lower and upper bound on the distance between two cells
+
+        Bounds are exact when either cell is a landmark. Returns (None, None)
+        when no landmark reaches both cells.
+        """
+        if tuple(a) in self._index:
+            d = self._value(self._index[tuple(a)], b)
+            return d, d
+        if tuple(b) in self._index:
+            d = self._value(self._index[tuple(b)], a)
+            return d, d
+
+        da = self.fields[:, a[0], a[1]].astype(np.int64)
+        db = self.fields[:, b[0], b[1]].astype(np.int64)
+        shared = (da != self.unreachable) & (db != self.unreachable)
+        if not shared.any():
+            return None, None
+        da, db = da[shared], db[shared]
+        return int(np.abs(da - db).max()), int((da + db).min())
+
+    def save(self, prefix):
+        """Write the oracle to <prefix>_fields.npy, <prefix>_landmarks.npy and <prefix>_meta.json"""
+        np.save(f"{prefix}_fields.npy", self.fields)
+        np.save(f"{prefix}_landmarks.npy", self.landmarks)
+        with open(f"{prefix}_meta.json", 'w') as f:
+            json.dump({'build_time': self.build_time}, f)
+
+    @classmethod
+    def load(cls, prefix, mmap=True):
+        """Load an oracle saved with save(), memory-mapping the distance fields"""
+        fields = np.load(f"{prefix}_fields.npy", mmap_mode='r' if mmap else None)
+        landmarks = np.load(f"{prefix}_landmarks.npy")
+        with open(f"{prefix}_meta.json") as f:
+            meta = json.load(f)
+        return cls(landmarks, fields, meta['build_time'])
+
+
+if __name__ == "__main__":
+    from maze_generator import generate_maze
+    from maze_solverbfs import bfs_solve
+
+    maze, start, end = generate_maze(width=40, height=40, seed=7)
+    oracle = DistanceOracle.build(maze, [start, end], num_landmarks=4)
+    print(f"Built {len(oracle.landmarks)} fields in {oracle.build_time:.6f}s "
+          f"({oracle.nbytes} bytes, {oracle.fields.dtype})")
+
+    path = bfs_solve(maze, start, end)
+    print(f"BFS: {len(path) - 1} moves | Oracle: {oracle.distance_to(start, end)} moves")
+
+    cell = path[len(path) // 2]
+    t = time.time()
+    exit_cell, dist = oracle.nearest_exit(cell)
+    print(f"Nearest exit to {cell}: {exit_cell} at {dist} | Query: {(time.time() - t) * 1e6:.1f}us")
@@ -1,38 +1,40 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
 import random
-from collections import deque
+from maze_result import PROGRESS_INTERVAL
 
-def generate_maze(width=20, height=20, seed=None, multiple_solutions=True, extra_paths_ratio=0.15):
+def carve_backtracker(maze, rng, progress=None):
     """
-    Generate a maze with optional multiple solution paths.
+    Carve paths by randomized backtracking from the start cell.
     
-    Args:
-        width: Width of the maze
-        height: Height of the maze
-        seed: Random seed for reproducibility
-        multiple_solutions: If True, adds extra paths to create multiple solutions
-        extra_paths_ratio: Ratio of walls to remove (0.1 = 10% of walls become paths)
+    The recursion is unrolled onto an explicit stack so large mazes don't hit
+    the recursion limit; each frame is (x, y, shuffled directions, next
+    direction index).
     """
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-    
-    maze = np.ones((height, width), dtype=int)
-    
-    start = (0, 0)
-    end = (height - 1, width - 1)
+    height, width = maze.shape
+    steps = 0
     
-    # Use recursive backtracking to generate connected paths
     def carve_path(x, y):
+        nonlocal steps
         maze[y, x] = 0  # Mark as path
         
         # Define directions: right, down, left, up
         directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
-        random.shuffle(directions)
+        rng.shuffle(directions)
+        stack = [(x, y, directions, 0)]
         
-        for dx, dy in directions:
+        while stack:
+            # Each cell is popped 5 times, so 5 * cells steps is a full maze
+            if progress is not None:
+                steps += 1
+                if steps % PROGRESS_INTERVAL == 0:
+                    progress(steps, 5 * maze.size)
+            
+            x, y, directions, i = stack.pop()
+            if i == len(directions):
+                continue
+            stack.append((x, y, directions, i + 1))
+            
+            dx, dy = directions[i]
             nx, ny = x + dx, y + dy
             
             # Check if the new position is valid and is a wall
@@ -47,55 +49,347 @@ def generate_maze(width=20, height=20, seed=None, multiple_solutions=True, extra
                 
                 # Only carve if it won't create multiple connections
                 if neighbors <= 1:
-                    carve_path(nx, ny)
+                    maze[ny, nx] = 0
+                    next_directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+                    rng.shuffle(next_directions)
+                    stack.append((nx, ny, next_directions, 0))
     
     # Start carving from the start position
-    carve_path(start[0], start[1])
+    carve_path(0, 0)
+
+# The remaining generators carve a perfect maze on a lattice of rooms at
+# even (y, x) coordinates; the odd cells between two rooms are passages.
+def _room_grid(maze):
+    """Number of room rows and columns in the maze"""
+    return (maze.shape[0] + 1) // 2, (maze.shape[1] + 1) // 2
+
+def _open_passages(maze, east, south):
+    """
+    Open every room plus the chosen passages.
+    
+    Args:
+        maze: The maze array, all walls
+        east: (rows, cols - 1) bool, passage from room (r, c) to (r, c + 1)
+        south: (rows - 1, cols) bool, passage from room (r, c) to (r + 1, c)
+    """
+    rows, cols = _room_grid(maze)
+    maze[::2, ::2] = 0
+    maze[::2, 1::2][:, :cols - 1][east] = 0
+    maze[1::2, ::2][:rows - 1][south] = 0
+
+def _numpy_rng(rng):
+    """numpy Generator seeded from rng, so seeded runs stay reproducible"""
+    return np.random.default_rng(rng.getrandbits(64))
+
+def carve_kruskal(maze, rng, progress=None):
+    """
+    Kruskal's algorithm: join rooms along shuffled passages, skipping any
+    passage whose rooms are already connected (array-based union-find).
+    """
+    rows, cols = _room_grid(maze)
+    num_east = rows * (cols - 1)
+    num_edges = num_east + (rows - 1) * cols
+    
+    # Union-find over room ids (r * cols + c), with path halving
+    parent = list(range(rows * cols))
+    
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+    
+    chosen = []
+    remaining = rows * cols - 1
+    for step, edge in enumerate(_numpy_rng(rng).permutation(num_edges).tolist()):
+        if remaining == 0:
+            break
+        if progress is not None and step % PROGRESS_INTERVAL == 0:
+            progress(rows * cols - 1 - remaining, rows * cols - 1)
+        if edge < num_east:
+            # East passage: edge numbers run r * (cols - 1) + c
+            r, c = divmod(edge, cols - 1)
+            a = r * cols + c
+            b = a + 1
+        else:
+            a = edge - num_east
+            b = a + cols
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+            chosen.append(edge)
+            remaining -= 1
+    
+    passages = np.zeros(num_edges, dtype=bool)
+    passages[chosen] = True
+    _open_passages(maze, passages[:num_east].reshape(rows, cols - 1),
+                   passages[num_east:].reshape(rows - 1, cols))
+
+def eller_rows(width, height, rng):
+    """
+    Eller's algorithm, yielding the maze one row at a time.
+    
+    Only the set labels of the current row are kept, so memory is O(width)
+    and rows can be written out as they are produced.
+    
+    Yields:
+        uint8 arrays of length width (0 = path, 1 = wall), top to bottom
+    """
+    nprng = _numpy_rng(rng)
+    rows, cols = (height + 1) // 2, (width + 1) // 2
+    labels = list(range(cols))
+    next_label = cols
+    
+    for r in range(rows):
+        last = r == rows - 1
+        
+        # Join neighbouring rooms in different sets (always, on the last row)
+        join = nprng.random(cols - 1) < 0.5
+        merged = {}
+        
+        def find(a):
+            while a in merged:
+                a = merged[a]
+            return a
+        
+        east = np.zeros(cols - 1, dtype=bool)
+        for c in range(cols - 1):
+            a, b = find(labels[c]), find(labels[c + 1])
+            if a != b and (last or join[c]):
+                merged[b] = a
+                east[c] = True
+        labels = np.array([find(label) for label in labels])
+        
+        room_row = np.ones(width, dtype=np.uint8)
+        room_row[::2] = 0
+        room_row[1::2][:cols - 1][east] = 0
+        yield room_row
+        
+        if last:
+            # An even height leaves one extra row of wall below the last rooms
+            if height % 2 == 0:
+                yield np.ones(width, dtype=np.uint8)
+            return
+        
+        # Every set continues down through at least one random room
+        down = nprng.random(cols) < 0.5
+        _, group = np.unique(labels, return_inverse=True)
+        has_down = np.zeros(group.max() + 1, dtype=bool)
+        has_down[group[down]] = True
+        shuffled = nprng.permutation(cols)
+        _, first = np.unique(group[shuffled], return_index=True)
+        member = shuffled[first]
+        down[member[~has_down]] = True
+        
+        passage_row = np.ones(width, dtype=np.uint8)
+        passage_row[::2][down] = 0
+        yield passage_row
+        
+        # Rooms not joined from above start new sets
+        labels = np.where(down, labels, next_label + np.arange(cols)).tolist()
+        next_label += cols
+
+def carve_eller(maze, rng, progress=None):
+    """Eller's algorithm, filling the maze row by row from eller_rows()"""
+    height, width = maze.shape
+    rows_per_report = max(1, PROGRESS_INTERVAL // width)
+    for y, row in enumerate(eller_rows(width, height, rng)):
+        maze[y] = row
+        if progress is not None and y % rows_per_report == 0:
+            progress(y, height)
+
+def carve_binary_tree(maze, rng, progress=None):
+    """
+    Binary tree: every room opens north or west at random (fully vectorized).
+    
+    The top row can only go west and the left column only north, so every
+    room leads back to the start.
+    """
+    rows, cols = _room_grid(maze)
+    north = _numpy_rng(rng).random((rows, cols)) < 0.5
+    north[0, :] = False
+    north[:, 0] = True
+    north[0, 0] = False
+    west = ~north
+    west[0, 0] = False
+    _open_passages(maze, west[:, 1:], north[1:, :])
+
+def carve_sidewinder(maze, rng, progress=None):
+    """
+    Sidewinder: the top row is one corridor; below it, rooms form random
+    east-west runs and each run opens north from one random room (vectorized).
+    """
+    rows, cols = _room_grid(maze)
+    nprng = _numpy_rng(rng)
+    
+    # Where each run ends; the last room of a row always ends its run
+    close = nprng.random((rows, cols)) < 0.5
+    close[:, -1] = True
+    close[0, :-1] = False
+    east = ~close[:, :-1]
+    
+    if rows == 1:
+        _open_passages(maze, east, np.zeros((0, cols), dtype=bool))
+        return
+    
+    # Runs in rows below the top, flattened (runs never cross rows)
+    flat_close = close[1:].ravel()
+    run_starts = np.flatnonzero(np.concatenate([[True], flat_close[:-1]]))
+    run_lengths = np.diff(np.append(run_starts, flat_close.size))
+    picks = run_starts + (nprng.random(run_starts.size) * run_lengths).astype(np.int64)
+    
+    north = np.zeros(flat_close.size, dtype=bool)
+    north[picks] = True
+    _open_passages(maze, east, north.reshape(rows - 1, cols))
+
+def _remove_extra_walls(maze, extra_paths_ratio, nprng, progress=None):
+    """
+    Open each removable interior wall with probability extra_paths_ratio.
+    
+    A wall is removable if it has 2 or more path neighbours in the maze as
+    carved. Works through blocks of rows so memory stays a few MB however big
+    the maze is; each block's picks are applied only after the next block
+    (whose top halo row they touch) has been scanned.
+    """
+    height, width = maze.shape
+    flat = maze.reshape(-1)
+    block = max(1, 16 * PROGRESS_INTERVAL // width)
+    pending = None
+    for y0 in range(1, height - 1, block):
+        y1 = min(y0 + block, height - 1)
+        paths = maze[y0 - 1:y1 + 1] == 0
+        path_neighbors = (paths[1:-1, 2:].astype(np.int8) + paths[2:, 1:-1]
+                          + paths[1:-1, :-2] + paths[:-2, 1:-1])
+        picked = (maze[y0:y1, 1:-1] == 1) & (path_neighbors >= 2)
+        picked &= nprng.random(picked.shape, dtype=np.float32) < extra_paths_ratio
+        
+        if pending is not None:
+            flat[pending] = 0
+        ys, xs = np.nonzero(picked)
+        pending = (ys + y0) * width + xs + 1
+        if progress is not None:
+            progress(y1, height)
+    
+    if pending is not None:
+        flat[pending] = 0
+
+# Maze generation algorithms selectable by name in generate_maze
+GENERATORS = {
+    'backtracker': carve_backtracker,
+    'kruskal': carve_kruskal,
+    'eller': carve_eller,
+    'binary_tree': carve_binary_tree,
+    'sidewinder': carve_sidewinder,
+}
+
+# Largest side the pure-Python carvers are offered at, roughly where one
+# maze passes 20s; the others have no cap
+SIZE_CAPS = {'backtracker': 2000, 'kruskal': 5000}
+
+def generate_maze(width=20, height=20, seed=None, multiple_solutions=True, extra_paths_ratio=0.15, rng=None,
+                  algorithm='backtracker', progress=None):
+    """
+    Generate a maze with optional multiple solution paths.
+    
+    Randomness comes from a private random.Random per call, never the global
+    random module, so concurrent calls can't disturb each other's seeded runs.
+    
+    Args:
+        width: Width of the maze
+        height: Height of the maze
+        seed: Random seed for reproducibility
+        multiple_solutions: If True, adds extra paths to create multiple solutions
+        extra_paths_ratio: Ratio of walls to remove (0.1 = 10% of walls become paths)
+        rng: Optional random.Random to draw from instead of seeding a new one
+        algorithm: Name of the generator in GENERATORS
+        progress: Optional callable(done, total) that the slower generators and
+            the extra-paths pass call every PROGRESS_INTERVAL steps or so; raise
+            from it to abort generation
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze algorithm {algorithm!r}, expected one of {list(GENERATORS)}")
+    
+    if rng is None:
+        rng = random.Random(seed)
+    
+    maze = np.ones((height, width), dtype=np.uint8)
+    
+    start = (0, 0)
+    end = (height - 1, width - 1)
+    
+    carve_progress = progress
+    if progress is not None and multiple_solutions:
+        # Carving fills the first half of the progress range, extra paths the second
+        carve_progress = lambda done, total: progress(done, 2 * total)
+    
+    # Carve connected paths from the start position
+    GENERATORS[algorithm](maze, rng, carve_progress)
     
     # Ensure end position is also a path
-    maze[end[1], end[0]] = 0
+    maze[end[0], end[1]] = 0
     
     # If end is isolated, carve a path to it
-    if maze[end[1], end[0]] == 0:
+    if maze[end[0], end[1]] == 0:
         # Try to connect end to an existing path
         for dx, dy in [(0, -1), (-1, 0), (0, 1), (1, 0)]:
-            nx, ny = end[0] + dx, end[1] + dy
+            ny, nx = end[0] + dy, end[1] + dx
             if 0 <= nx < width and 0 <= ny < height and maze[ny, nx] == 0:
                 break
         else:
             # Force a connection if needed
-            if end[1] > 0:
-                maze[end[1] - 1, end[0]] = 0
+            if end[0] > 0:
+                maze[end[0] - 1, end[1]] = 0
     
     # Add multiple solution paths by removing some walls
-    if multiple_solutions:
-        # Find all walls that can be safely removed
-        removable_walls = []
+    if multiple_solutions and algorithm != 'backtracker':
+        # Sampled in blocks with numpy; a Python sample over every removable
+        # wall of a large lattice maze costs far more than carving it
+        _remove_extra_walls(maze, extra_paths_ratio, _numpy_rng(rng),
+                            None if progress is None else lambda done, total: progress(total + done, 2 * total))
+    elif multiple_solutions:
+        if progress is not None:
+            progress(1, 2)
+        
+        # Find all interior walls that can be safely removed (kept as is so
+        # seeded backtracker mazes stay identical to earlier releases)
+        paths = maze == 0
+        path_neighbors = (paths[1:-1, 2:].astype(np.int8) + paths[2:, 1:-1]
+                          + paths[1:-1, :-2] + paths[:-2, 1:-1])
         
-        for y in range(1, height - 1):
-            for x in range(1, width - 1):
-                if maze[y, x] == 1:  # It's a wall
-                    # Check if this wall has paths on at least 2 sides
-                    path_neighbors = 0
-                    for dy, dx in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        ny, nx = y + dy, x + dx
-                        if 0 <= ny < height and 0 <= nx < width and maze[ny, nx] == 0:
-                            path_neighbors += 1
-                    
-                    # If wall has 2 or more path neighbors, it can create alternative routes
-                    if path_neighbors >= 2:
-                        removable_walls.append((y, x))
+        # If wall has 2 or more path neighbors, it can create alternative routes
+        removable_walls = np.argwhere((maze[1:-1, 1:-1] == 1) & (path_neighbors >= 2)) + 1
         
         # Remove a percentage of these walls to create alternative paths
+        # (sampling indices picks the same walls as sampling the list itself)
         num_to_remove = int(len(removable_walls) * extra_paths_ratio)
-        walls_to_remove = random.sample(removable_walls, min(num_to_remove, len(removable_walls)))
+        picks = rng.sample(range(len(removable_walls)), min(num_to_remove, len(removable_walls)))
+        walls_to_remove = removable_walls[picks]
         
-        for y, x in walls_to_remove:
-            maze[y, x] = 0
+        maze[walls_to_remove[:, 0], walls_to_remove[:, 1]] = 0
     
     return maze, start, end
 
+def generate_mazes(count, width=20, height=20, seed=None, multiple_solutions=True, extra_paths_ratio=0.15,
+                   algorithm='backtracker'):
+    """
+    Generate many mazes from one seed stream.
+    
+    A single random.Random is shared across the batch, so the whole sequence
+    is reproducible from one seed without reseeding per maze.
+    
+    Yields:
+        (maze, start, end) tuples, as returned by generate_maze
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_maze(width, height, multiple_solutions=multiple_solutions,
+                            extra_paths_ratio=extra_paths_ratio, rng=rng, algorithm=algorithm)
+
 def display_maze(maze, path=None):
+    # Plotting is imported here so generating mazes never pays matplotlib's import cost
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    
     cmap = ListedColormap(['white', 'black', 'red', 'blue'])
     display_maze = maze.copy()
     
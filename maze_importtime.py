@@ -0,0 +1,86 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules that batch workers and the app import before anything is drawn
+CORE_MODULES = ['maze_generator', 'maze_solverbfs', 'maze_solverdfs', 'maze_solverastar',
+                'maze_result', 'maze_render', 'maze_jobs', 'maze_dataset', 'maze_distance_oracle']
+
+# Directory holding the maze modules; the measured interpreter runs from here
+# so they import wherever the check itself is started from
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Heavy packages none of the core modules may pull in at import time
+FORBIDDEN = ['matplotlib', 'streamlit']
+
+def _run_importtime(code):
+    """Run code in a fresh interpreter under python -X importtime
+
+    Returns:
+        (top_level, imported) mapping module names to cumulative import time in
+        ms, for top-level imports only and for every module loaded
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=MODULE_DIR, capture_output=True, text=True, check=True)
+
+    top_level = {}
+    imported = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = int(cumulative) / 1000
+        if not name.startswith('  '):  # top-level import, nested ones are in its cumulative
+            top_level[name.strip()] = int(cumulative) / 1000
+    return top_level, imported
+
+def measure_import_time(modules):
+    """Cold-import modules in a fresh interpreter under python -X importtime
+
+    Modules the interpreter loads at startup (site, encodings, ...) are
+    measured with `-c pass` and left out, so only the cost of importing
+    modules is counted.
+
+    Returns:
+        (total_ms, imported) where imported maps every module name loaded by
+        modules to its cumulative import time in ms
+    """
+    _, startup = _run_importtime('pass')
+    top_level, imported = _run_importtime('import ' + ', '.join(modules))
+
+    total_ms = sum(ms for name, ms in top_level.items() if name not in startup)
+    imported = {name: ms for name, ms in imported.items() if name not in startup}
+    return total_ms, imported
+
+def budget_problems(total_ms, imported, budget_ms=300, forbidden=FORBIDDEN):
+    """Problems with a measure_import_time() result, empty when within budget"""
+    problems = [f"{name} imported by core modules" for name in forbidden if name in imported]
+    if total_ms > budget_ms:
+        slowest = sorted(imported.items(), key=lambda item: -item[1])[:5]
+        problems.append(f"cold import took {total_ms:.0f}ms, budget is {budget_ms:g}ms "
+                        f"(slowest: {', '.join(f'{n} {t:.0f}ms' for n, t in slowest)})")
+    return problems
+
+def check_import_budget(budget_ms=300, modules=CORE_MODULES, forbidden=FORBIDDEN):
+    """Check the cold-start cost of the core modules
+
+    Returns:
+        List of problems, empty when within budget
+    """
+    total_ms, imported = measure_import_time(modules)
+    return budget_problems(total_ms, imported, budget_ms, forbidden)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if maze module cold start regresses")
+    parser.add_argument('--budget-ms', type=float, default=300)
+    args = parser.parse_args()
+
+    total_ms, imported = measure_import_time(CORE_MODULES)
+    print(f"Cold import of {len(CORE_MODULES)} modules: {total_ms:.0f}ms (budget {args.budget_ms:g}ms)")
+    problems = budget_problems(total_ms, imported, args.budget_ms)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled"""
+
+
+class Job:
+    """Handle for one background job
+
+    The job function receives this object as its first argument and calls
+    report() to publish progress and partial results. The UI thread reads
+    them back with snapshot().
+    """
+
+    def __init__(self):
+        self.status = 'queued'  # queued, running, done, cancelled, failed
+        self.error = None
+        self.future = None
+        self._results = {}
+        self._progress = 0.0
+        self._message = 'Queued...'
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def report(self, key=None, value=None, progress=None, message=None):
+        """Publish a partial result and/or progress update
+
+        Args:
+            key: Name of the result to store (skipped if None)
+            value: The result value
+            progress: Fraction complete between 0 and 1
+            message: Short status text
+
+        Raises:
+            JobCancelled: If the job has been cancelled, so the job function stops
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        with self._lock:
+            if key is not None:
+                self._results[key] = value
+            if progress is not None:
+                self._progress = progress
+            if message is not None:
+                self._message = message
+
+    def progress_callback(self, start, end):
+        """Callback for a long-running stage that reports into this job
+
+        Returns:
+            progress(done, total), mapping the stage's own progress onto
+            [start, end] of the whole job. It raises JobCancelled once the job
+            is cancelled, so passing it into a loop makes that loop cancellable.
+        """
+        def progress(done, total):
+            self.report(progress=start + (end - start) * min(done / max(total, 1), 1.0))
+        return progress
+
+    def snapshot(self):
+        """Return (results, progress, message) as published so far"""
+        with self._lock:
+            return dict(self._results), self._progress, self._message
+
+    def cancel(self):
+        """Ask the job to stop at its next report() call"""
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = 'cancelled'
+
+    @property
+    def done(self):
+        return self.status in ('done', 'cancelled', 'failed')
+
+
+class JobQueue:
+    """Bounded pool of worker threads running Job functions
+
+    Args:
+        max_workers: Number of jobs that run at the same time
+        max_pending: Number of jobs (running + queued) accepted before submit() refuses
+    """
+
+    def __init__(self, max_workers=2, max_pending=8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='maze-job')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(job, *args, **kwargs) and return its Job
+
+        Raises:
+            RuntimeError: If max_pending jobs are already queued or running
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RuntimeError("Too many maze jobs in progress, please try again shortly")
+
+        job = Job()
+
+        def run():
+            job.status = 'running'
+            try:
+                fn(job, *args, **kwargs)
+                job.status = 'done'
+            except JobCancelled:
+                job.status = 'cancelled'
+            except Exception as exc:
+                job.error = exc
+                job.status = 'failed'
+
+        job.future = self._executor.submit(run)
+        job.future.add_done_callback(lambda _: self._slots.release())
+        return job
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,260 @@
+import numpy as np
+from maze_result import CellPath, CellSet
+
+# Display codes, ordered by drawing priority so max-pooling a block keeps the
+# most important thing in it (any wall beats open space, any path beats a wall)
+FREE, WALL, EXPLORED, PATH, START, END = range(6)
+COLORS = ['white', 'black', 'yellow', 'cyan', 'lime', 'red']
+
+# Levels at or below this are never stored: a window that needs one is at most
+# max_pixels * 2 ** ON_DEMAND_LEVEL cells across, cheap to compose on each view
+ON_DEMAND_LEVEL = 2
+
+# Cells composed per block while building the stored levels
+BLOCK_CELLS = 1 << 20
+
+def _visited_rows(bits, width, y0, y1):
+    """Unpack rows y0 to y1 of a packed row-major bitmap as a bool array"""
+    start, stop = y0 * width, y1 * width
+    chunk = np.unpackbits(bits[start >> 3:(stop + 7) >> 3])
+    offset = start & 7
+    return chunk[offset:offset + stop - start].view(bool).reshape(y1 - y0, width)
+
+
+def _flat_cells(cells, width):
+    """Flat indices of an iterable of (y, x) tuples"""
+    cells = np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+    return cells[:, 0] * width + cells[:, 1]
+
+
+def _paint(image, flat, width, window, code):
+    """Set the cells of flat that fall inside window to code"""
+    y0, x0, h, w = window
+    ys, xs = np.divmod(flat, width)
+    keep = (ys >= y0) & (ys < y0 + h) & (xs >= x0) & (xs < x0 + w)
+    image[ys[keep] - y0, xs[keep] - x0] = code
+
+
+def compose(maze, start, end, path=None, visited=None, window=None):
+    """Build the full-resolution display image for one solver
+
+    Args:
+        maze: The maze array
+        start: Starting position tuple
+        end: End position tuple
+        path: Optional CellPath, list of position tuples, or sorted array of
+            flat indices (only the window's rows are then looked at)
+        visited: Optional CellSet or iterable of explored position tuples
+        window: Optional (y0, x0, height, width) region, defaults to the whole maze
+
+    Returns:
+        uint8 array of display codes shaped like the window
+    """
+    height, width = maze.shape
+    window = window or (0, 0, height, width)
+    y0, x0, h, w = window
+    # WALL is 1 and FREE 0, so the wall mask's bytes are already the image
+    image = (maze[y0:y0 + h, x0:x0 + w] == 1).view(np.uint8)
+
+    # SolveResult views are painted straight from their arrays
+    if isinstance(visited, CellSet):
+        # EXPLORED outranks WALL and FREE, so a max paints it without a masked copy
+        explored = _visited_rows(visited.bits, width, y0, y0 + h)[:, x0:x0 + w].view(np.uint8)
+        np.maximum(image, explored * np.uint8(EXPLORED), out=image)
+    elif visited:
+        _paint(image, _flat_cells(visited, width), width, window, EXPLORED)
+    if isinstance(path, np.ndarray):
+        # Bounds in the path's own dtype, or numpy converts the whole array to search it
+        lo, hi = path.searchsorted(np.array([y0 * width, (y0 + h) * width], dtype=path.dtype))
+        _paint(image, path[lo:hi], width, window, PATH)
+    elif isinstance(path, CellPath):
+        _paint(image, path.flat, width, window, PATH)
+    elif path:
+        _paint(image, _flat_cells(path, width), width, window, PATH)
+
+    for cell, code in ((start, START), (end, END)):
+        if y0 <= cell[0] < y0 + h and x0 <= cell[1] < x0 + w:
+            image[cell[0] - y0, cell[1] - x0] = code
+    return image
+
+
+def _max_pool(image, scale):
+    """Downsample by scale x scale max-pooling, scale a power of two
+
+    Far edges are padded with FREE. Done as rounds of 2x2 pooling over
+    strided views, which numpy runs much faster than a reshape and max.
+    """
+    while scale > 1:
+        h, w = image.shape
+        if h % 2 or w % 2:
+            image = np.pad(image, ((0, h % 2), (0, w % 2)), constant_values=FREE)
+        image = np.maximum(np.maximum(image[0::2, 0::2], image[0::2, 1::2]),
+                           np.maximum(image[1::2, 0::2], image[1::2, 1::2]))
+        scale //= 2
+    return image
+
+
+def top_level(shape, max_pixels=400):
+    """Coarsest level needed, the first at which the whole maze fits max_pixels"""
+    level = 0
+    while -(-max(shape) // 2 ** level) > max_pixels:
+        level += 1
+    return level
+
+
+def build_levels(maze, start, end, path=None, visited=None, max_pixels=400, progress=None):
+    """Max-pooled display levels for one solver, finest first
+
+    Level l is the compose() image max-pooled by 2 ** l, so any wall or path
+    in a block shows up. Only levels above ON_DEMAND_LEVEL are built, a few MB
+    even for a 10000x10000 maze; they are composed a block of rows at a time,
+    so no full-resolution image is held.
+
+    Args:
+        maze, start, end, path, visited: As for compose()
+        max_pixels: The last level fits the whole maze in this many pixels
+        progress: Optional callable(done, total), called after each block
+
+    Returns:
+        List indexed by level, None for the levels composed on demand
+    """
+    height, width = maze.shape
+    top = top_level(maze.shape, max_pixels)
+    levels = [None] * (top + 1)
+    if top <= ON_DEMAND_LEVEL:
+        return levels
+
+    scale = 2 ** (ON_DEMAND_LEVEL + 1)
+    block = scale * max(1, BLOCK_CELLS // (width * scale))
+    rows = []
+    for y0 in range(0, height, block):
+        image = compose(maze, start, end, path, visited, (y0, 0, min(block, height - y0), width))
+        rows.append(_max_pool(image, scale))
+        if progress is not None:
+            progress(y0 + block, height)
+    levels[ON_DEMAND_LEVEL + 1] = np.concatenate(rows)
+
+    for level in range(ON_DEMAND_LEVEL + 2, top + 1):
+        levels[level] = _max_pool(levels[level - 1], 2)
+    return levels
+
+
+class MazeLayers:
+    """Everything needed to draw one solver's panel at any zoom
+
+    Built once per result, in the job worker: the stored coarse levels for
+    both "Show Explored Cells" settings plus the sources for composing finer
+    windows on each view (the maze, the visited bitmap and the path as sorted
+    flat indices). No full-resolution image is kept.
+
+    Args:
+        maze, start, end: As for compose()
+        result: Optional SolveResult, None for a maze that isn't solved yet
+        max_pixels: Largest tile side drawn per panel
+        progress: Optional callable(done, total) for the level building
+    """
+
+    __slots__ = ('maze', 'start', 'end', 'path', 'visited', 'levels')
+
+    def __init__(self, maze, start, end, result=None, max_pixels=400, progress=None):
+        self.maze = maze
+        self.start = start
+        self.end = end
+        self.path = None if result is None or result.path is None else np.sort(result.path.flat)
+        self.visited = None if result is None else result.visited
+
+        variants = [False] if self.visited is None else [False, True]
+        self.levels = {}
+        for i, explored in enumerate(variants):
+            step = None if progress is None else (
+                lambda done, total, i=i: progress(i * total + min(done, total), len(variants) * total))
+            self.levels[explored] = build_levels(maze, start, end, self.path,
+                                                 self.visited if explored else None, max_pixels, step)
+
+    @property
+    def nbytes(self):
+        """Memory held by the stored levels and the sorted path in bytes"""
+        total = 0 if self.path is None else self.path.nbytes
+        for levels in self.levels.values():
+            total += sum(level.nbytes for level in levels if level is not None)
+        return total
+
+
+def view_size(shape, zoom):
+    """(view_height, view_width) in maze cells at a zoom level"""
+    height, width = shape
+    return max(1, -(-height // 2 ** zoom)), max(1, -(-width // 2 ** zoom))
+
+
+def pan_step(view_cells):
+    """Pan slider step for a view this many cells across
+
+    A quarter of the view, so consecutive positions overlap and every
+    full-resolution tile can be reached.
+    """
+    return max(1, view_cells // 4)
+
+
+def view_window(shape, zoom, center_y=None, center_x=None):
+    """Region of the maze shown at a zoom level
+
+    Args:
+        shape: (height, width) of the maze
+        zoom: 0 shows the whole maze, each step halves the visible size
+        center_y, center_x: View centre in maze cells (defaults to the middle);
+            the window is clamped to stay inside the maze
+
+    Returns:
+        (y0, x0, view_height, view_width) in maze cells
+    """
+    height, width = shape
+    view_h, view_w = view_size(shape, zoom)
+    if center_y is None:
+        center_y = height // 2
+    if center_x is None:
+        center_x = width // 2
+    y0 = min(max(int(center_y) - view_h // 2, 0), height - view_h)
+    x0 = min(max(int(center_x) - view_w // 2, 0), width - view_w)
+    return y0, x0, view_h, view_w
+
+
+def max_zoom(shape, min_cells=20):
+    """Deepest zoom level that still shows at least min_cells across"""
+    zoom = 0
+    while max(shape) / 2 ** (zoom + 1) >= min_cells:
+        zoom += 1
+    return zoom
+
+
+def render_view(layers, window, show_explored=False, max_pixels=400):
+    """Tile for the window from the coarsest level that still resolves it on screen
+
+    Stored levels are sliced; finer ones are composed for just the window.
+
+    Args:
+        layers: MazeLayers for the solver
+        window: (y0, x0, view_height, view_width) in maze cells
+        show_explored: Whether to paint explored cells (when the layers have them)
+        max_pixels: Largest tile side to return
+
+    Returns:
+        (tile, level) where tile is a uint8 array at most max_pixels per side
+    """
+    levels = layers.levels.get(show_explored, layers.levels[False])
+    y0, x0, view_h, view_w = window
+    level = 0
+    while level + 1 < len(levels) and max(view_h, view_w) > max_pixels * 2 ** level:
+        level += 1
+    scale = 2 ** level
+    ty0, tx0 = y0 // scale, x0 // scale
+    ty1, tx1 = -(-(y0 + view_h) // scale), -(-(x0 + view_w) // scale)
+    if levels[level] is not None:
+        return levels[level][ty0:ty1, tx0:tx1], level
+
+    # Compose the block-aligned region so the tile matches a stored level's slice
+    height, width = layers.maze.shape
+    region = (ty0 * scale, tx0 * scale,
+              min(ty1 * scale, height) - ty0 * scale, min(tx1 * scale, width) - tx0 * scale)
+    image = compose(layers.maze, layers.start, layers.end, layers.path,
+                    layers.visited if show_explored else None, region)
+    return _max_pool(image, scale), level
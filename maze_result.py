@@ -0,0 +1,195 @@
+from collections.abc import Sequence, Set
+import numpy as np
+
+# Long-running loops call their progress callback once every this many steps
+PROGRESS_INTERVAL = 1 << 16
+
+def padded_grid(maze):
+    """Flatten a maze with a one-cell wall border
+
+    Solvers walk flat indices into this grid, so a neighbour is just an offset
+    and never needs a bounds check.
+
+    Returns:
+        (passable, padded_width) where passable is a bytes object, 1 for open cells
+    """
+    passable = np.pad(maze != 1, 1, constant_values=False)
+    return passable.astype(np.uint8).ravel().tobytes(), maze.shape[1] + 2
+
+
+def padded_index(cell, padded_width):
+    """Flat index of a (y, x) cell in the padded grid"""
+    return (cell[0] + 1) * padded_width + cell[1] + 1
+
+
+def path_cells(path, padded_width):
+    """Convert padded flat indices back to a list of (y, x) tuples"""
+    return [(p // padded_width - 1, p % padded_width - 1) for p in path]
+
+
+class CellPath(Sequence):
+    """Read-only sequence of (y, x) tuples backed by an int32 flat-index array"""
+
+    __slots__ = ('flat', 'width')
+
+    def __init__(self, flat, width):
+        self.flat = flat
+        self.width = width
+
+    def __len__(self):
+        return len(self.flat)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._cell(p) for p in self.flat[i]]
+        return self._cell(self.flat[i])
+
+    def __iter__(self):
+        width = self.width
+        for p in self.flat.tolist():
+            yield (p // width, p % width)
+
+    def _cell(self, p):
+        return (int(p) // self.width, int(p) % self.width)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'CellPath({len(self)} cells)'
+
+
+class CellSet(Set):
+    """Read-only set of (y, x) tuples backed by a packed bitmap
+
+    Comparisons and set operators (==, <=, &, |, -) come from
+    collections.abc.Set and return plain sets where a new set is built.
+    """
+
+    __slots__ = ('bits', 'shape', 'count')
+
+    def __init__(self, bits, shape, count):
+        self.bits = bits
+        self.shape = shape
+        self.count = count
+
+    @property
+    def mask(self):
+        """Unpacked boolean array shaped like the maze"""
+        size = self.shape[0] * self.shape[1]
+        return np.unpackbits(self.bits, count=size).view(bool).reshape(self.shape)
+
+    def __len__(self):
+        return self.count
+
+    @classmethod
+    def _from_iterable(cls, cells):
+        return set(cells)
+
+    def __contains__(self, cell):
+        try:
+            y, x = cell
+        except (TypeError, ValueError):
+            return False
+        if not (0 <= y < self.shape[0] and 0 <= x < self.shape[1]):
+            return False
+        p = y * self.shape[1] + x
+        return bool(self.bits[p >> 3] >> (7 - (p & 7)) & 1)
+
+    def __iter__(self):
+        ys, xs = np.nonzero(self.mask)
+        return zip(ys.tolist(), xs.tolist())
+
+    def __repr__(self):
+        return f'CellSet({self.count} cells)'
+
+
+class SolveResult:
+    """Compact result of one solver run
+
+    Visited cells are kept as a packed bitmap, the path and optional expansion
+    order as int32 flat indices into the maze. Unpacking gives the old
+    (path, visited, elapsed_time) tuple, with path and visited as lazy views.
+    """
+
+    __slots__ = ('shape', 'visited_bits', 'explored', 'path_index', 'order', 'elapsed_time')
+
+    def __init__(self, shape, visited_bits, explored, path_index, elapsed_time, order=None):
+        self.shape = shape
+        self.visited_bits = visited_bits
+        self.explored = explored
+        self.path_index = path_index
+        self.elapsed_time = elapsed_time
+        self.order = order
+
+    @classmethod
+    def from_padded(cls, shape, visited, path, elapsed_time, order=None):
+        """Build a result from a solver's padded-grid state
+
+        Args:
+            shape: (height, width) of the maze
+            visited: bytearray over the padded grid, nonzero for visited cells
+            path: List of padded flat indices, or None if no path was found
+            elapsed_time: Solve time in seconds
+            order: Optional array of padded flat indices in expansion order
+        """
+        height, width = shape
+        padded_width = width + 2
+
+        mask = np.frombuffer(visited, dtype=np.uint8).reshape(height + 2, padded_width)[1:-1, 1:-1] != 0
+
+        def unpad(index):
+            index = np.asarray(index, dtype=np.int64)
+            return ((index // padded_width - 1) * width + index % padded_width - 1).astype(np.int32)
+
+        return cls(
+            shape,
+            np.packbits(mask),
+            int(np.count_nonzero(mask)),
+            None if path is None else unpad(path),
+            elapsed_time,
+            None if order is None else unpad(order),
+        )
+
+    @property
+    def path(self):
+        """Solution path as a sequence of (y, x) tuples, or None"""
+        if self.path_index is None:
+            return None
+        return CellPath(self.path_index, self.shape[1])
+
+    @property
+    def visited(self):
+        """Visited cells as a set-like view of (y, x) tuples"""
+        return CellSet(self.visited_bits, self.shape, self.explored)
+
+    @property
+    def path_length(self):
+        return None if self.path_index is None else len(self.path_index)
+
+    @property
+    def nbytes(self):
+        """Memory held by the result arrays in bytes"""
+        total = self.visited_bits.nbytes
+        for arr in (self.path_index, self.order):
+            if arr is not None:
+                total += arr.nbytes
+        return total
+
+    # Behaves like the old (path, visited, elapsed_time) tuple
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, i):
+        return (self.path, self.visited, self.elapsed_time)[i]
+
+    def __iter__(self):
+        return iter((self.path, self.visited, self.elapsed_time))
+
+    def __repr__(self):
+        return (f'SolveResult(path_length={self.path_length}, explored={self.explored}, '
+                f'elapsed_time={self.elapsed_time:.6f})')
@@ -1,93 +1,112 @@
+from array import array
 import heapq
 import time
+from maze_result import PROGRESS_INTERVAL, SolveResult, padded_grid, padded_index, path_cells
 
-def astar_solve(maze, start, end, return_visited=False):
+def astar_solve(maze, start, end, return_visited=False, record_order=False, progress=None):
     """Solve maze using A* algorithm
     
     Args:
         maze: The maze array
         start: Starting position tuple
         end: End position tuple
-        return_visited: If True, returns (path, visited_set, elapsed_time)
+        return_visited: If True, returns a SolveResult, which unpacks as
+            (path, visited, elapsed_time)
+        record_order: If True, the SolveResult also keeps the expansion order
+        progress: Optional callable(done, total) called every PROGRESS_INTERVAL
+            steps; raise from it to abort the search
     
     Returns:
-        path or (path, visited, elapsed_time) if return_visited=True
+        path or SolveResult if return_visited=True
     """
     start_time = time.time()
     
-    height, width = maze.shape
+    # Flat indices into the maze padded with a wall border
+    passable, padded_width = padded_grid(maze)
+    source = padded_index(start, padded_width)
+    target = padded_index(end, padded_width)
+    end_y, end_x = divmod(target, padded_width)
     
     # Heuristic function (Manhattan distance)
     def heuristic(pos):
-        return abs(pos[0] - end[0]) + abs(pos[1] - end[1])
+        y, x = divmod(pos, padded_width)
+        return abs(y - end_y) + abs(x - end_x)
     
     # Priority queue: (f_score, counter, position)
     # counter ensures FIFO ordering for equal f_scores
     counter = 0
-    heap = [(heuristic(start), counter, start)]
+    heap = [(heuristic(source), counter, source)]
     
     # Track visited cells
-    visited = set()
+    visited = bytearray(len(passable))
     
-    # G-score: cost from start to current node
-    g_score = {start: 0}
+    # G-score: cost from start to current node (-1 = not seen yet)
+    g_score = array('i', [-1]) * len(passable)
+    g_score[source] = 0
     
     # Parent tracking (to reconstruct the path)
-    parent = {start: None}
+    parent = array('i', bytes(4 * len(passable)))
+    
+    # Expansion order, only kept if requested
+    order = array('i') if record_order else None
     
     # 4 directions: up, right, down, left
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    directions = (-padded_width, 1, padded_width, -1)
+    
+    path = None
+    steps = 0
     
     # A* algorithm
     while heap:
+        if progress is not None:
+            steps += 1
+            if steps % PROGRESS_INTERVAL == 0:
+                progress(steps, maze.size)
+        
         _, _, current = heapq.heappop(heap)
         
         # Skip if already visited
-        if current in visited:
+        if visited[current]:
             continue
         
-        visited.add(current)
+        visited[current] = 1
+        if order is not None:
+            order.append(current)
         
         # Did we reach the goal?
-        if current == end:
+        if current == target:
             # Reconstruct the path
-            path = []
-            while current is not None:
-                path.append(current)
+            path = [current]
+            while current != source:
                 current = parent[current]
+                path.append(current)
             path = path[::-1]  # Reverse
-            elapsed_time = time.time() - start_time
-            return (path, visited, elapsed_time) if return_visited else path
+            break
         
         # Check neighbors
-        y, x = current
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            neighbor = (ny, nx)
-            
-            # Boundary check
-            if not (0 <= ny < height and 0 <= nx < width):
-                continue
+        for offset in directions:
+            neighbor = current + offset
             
-            # Is it a wall?
-            if maze[ny, nx] == 1:
+            # Is it a wall (or outside the maze)?
+            if not passable[neighbor]:
                 continue
             
             # Already visited?
-            if neighbor in visited:
+            if visited[neighbor]:
                 continue
             
             # Calculate tentative g_score
             tentative_g = g_score[current] + 1
             
             # If this path is better than any previous one
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
                 g_score[neighbor] = tentative_g
                 f_score = tentative_g + heuristic(neighbor)
                 counter += 1
                 heapq.heappush(heap, (f_score, counter, neighbor))
                 parent[neighbor] = current
     
-    # No path found
     elapsed_time = time.time() - start_time
-    return (None, visited, elapsed_time) if return_visited else None
\ No newline at end of file
+    if not return_visited:
+        return None if path is None else path_cells(path, padded_width)
+    return SolveResult.from_padded(maze.shape, visited, path, elapsed_time, order)
@@ -1,72 +1,88 @@
+from array import array
 import time
+from maze_result import PROGRESS_INTERVAL, SolveResult, padded_grid, padded_index, path_cells
 
-def dfs_solve(maze, start, end, return_visited=False):
+def dfs_solve(maze, start, end, return_visited=False, record_order=False, progress=None):
     """Solve maze using DFS algorithm
     
     Args:
         maze: The maze array
         start: Starting position tuple
         end: End position tuple
-        return_visited: If True, returns (path, visited_set, elapsed_time)
+        return_visited: If True, returns a SolveResult, which unpacks as
+            (path, visited, elapsed_time)
+        record_order: If True, the SolveResult also keeps the expansion order
+        progress: Optional callable(done, total) called every PROGRESS_INTERVAL
+            steps; raise from it to abort the search
     
     Returns:
-        path or (path, visited, elapsed_time) if return_visited=True
+        path or SolveResult if return_visited=True
     """
     start_time = time.time()
     
-    height, width = maze.shape
+    # Flat indices into the maze padded with a wall border
+    passable, padded_width = padded_grid(maze)
+    source = padded_index(start, padded_width)
+    target = padded_index(end, padded_width)
     
     # Stack - LIFO
-    stack = [start]
+    stack = [source]
     
     # Track visited cells
-    visited = set([start])
+    visited = bytearray(len(passable))
+    visited[source] = 1
     
     # Parent tracking (to reconstruct the path)
-    parent = {start: None}
+    parent = array('i', bytes(4 * len(passable)))
+    
+    # Expansion order, only kept if requested
+    order = array('i') if record_order else None
     
     # 4 directions: up, right, down, left
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    directions = (-padded_width, 1, padded_width, -1)
+    
+    path = None
+    steps = 0
     
     # DFS
     while stack:
+        if progress is not None:
+            steps += 1
+            if steps % PROGRESS_INTERVAL == 0:
+                progress(steps, maze.size)
+        
         current = stack.pop()  # Get last element
+        if order is not None:
+            order.append(current)
         
         # Did we reach the goal?
-        if current == end:
+        if current == target:
             # Reconstruct the path
-            path = []
-            while current is not None:
-                path.append(current)
+            path = [current]
+            while current != source:
                 current = parent[current]
+                path.append(current)
             path = path[::-1]  # Reverse
-            elapsed_time = time.time() - start_time
-            return (path, visited, elapsed_time) if return_visited else path
+            break
         
         # Check neighbors
-        y, x = current
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            neighbor = (ny, nx)
-            
-            # Boundary check
-            if not (0 <= ny < height and 0 <= nx < width):
-                continue
+        for offset in directions:
+            neighbor = current + offset
             
-            # Is it a wall?
-            if maze[ny, nx] == 1:
+            # Is it a wall (or outside the maze)?
+            if not passable[neighbor]:
                 continue
             
             # Already visited?
-            if neighbor in visited:
+            if visited[neighbor]:
                 continue
             
             # Add to stack
             stack.append(neighbor)
-            visited.add(neighbor)
+            visited[neighbor] = 1
             parent[neighbor] = current
     
-    # No path found
     elapsed_time = time.time() - start_time
-    return (None, visited, elapsed_time) if return_visited else None
-
+    if not return_visited:
+        return None if path is None else path_cells(path, padded_width)
+    return SolveResult.from_padded(maze.shape, visited, path, elapsed_time, order)
@@ -1,228 +1,46 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
-from matplotlib.patches import Patch
-import random
-from collections import deque
-import heapq
 import time
+from maze_generator import generate_maze, GENERATORS, SIZE_CAPS
+from maze_solverdfs import dfs_solve
+from maze_solverbfs import bfs_solve
+from maze_solverastar import astar_solve
+from maze_jobs import JobQueue
+from maze_render import COLORS, MazeLayers, view_size, pan_step, view_window, max_zoom, render_view
 
 st.set_page_config(page_title="Maze Solver Comparison", page_icon="🧩", layout="wide")
 
-# Maze Generator Functions
-def generate_maze(width=20, height=20, seed=None, multiple_solutions=True, extra_paths_ratio=0.15):
-    """Generate a maze with optional multiple solution paths."""
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-    
-    maze = np.ones((height, width), dtype=int)
-    start = (0, 0)
-    end = (height - 1, width - 1)
-    
-    def carve_path(x, y):
-        maze[y, x] = 0
-        directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
-        random.shuffle(directions)
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height and maze[ny, nx] == 1:
-                neighbors = 0
-                for ddx, ddy in directions:
-                    nnx, nny = nx + ddx, ny + ddy
-                    if 0 <= nnx < width and 0 <= nny < height and maze[nny, nnx] == 0:
-                        neighbors += 1
-                if neighbors <= 1:
-                    carve_path(nx, ny)
-    
-    carve_path(start[0], start[1])
-    maze[end[1], end[0]] = 0
-    
-    if maze[end[1], end[0]] == 0:
-        for dx, dy in [(0, -1), (-1, 0), (0, 1), (1, 0)]:
-            nx, ny = end[0] + dx, end[1] + dy
-            if 0 <= nx < width and 0 <= ny < height and maze[ny, nx] == 0:
-                break
-        else:
-            if end[1] > 0:
-                maze[end[1] - 1, end[0]] = 0
-    
-    if multiple_solutions:
-        removable_walls = []
-        for y in range(1, height - 1):
-            for x in range(1, width - 1):
-                if maze[y, x] == 1:
-                    path_neighbors = 0
-                    for dy, dx in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        ny, nx = y + dy, x + dx
-                        if 0 <= ny < height and 0 <= nx < width and maze[ny, nx] == 0:
-                            path_neighbors += 1
-                    if path_neighbors >= 2:
-                        removable_walls.append((y, x))
-        
-        num_to_remove = int(len(removable_walls) * extra_paths_ratio)
-        walls_to_remove = random.sample(removable_walls, min(num_to_remove, len(removable_walls)))
-        for y, x in walls_to_remove:
-            maze[y, x] = 0
-    
-    return maze, start, end
-
-# DFS Solver
-def dfs_solve(maze, start, end):
-    """Solve maze using DFS algorithm"""
-    start_time = time.time()
-    height, width = maze.shape
-    stack = [start]
-    visited = set([start])
-    parent = {start: None}
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    while stack:
-        current = stack.pop()
-        if current == end:
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent[current]
-            elapsed_time = time.time() - start_time
-            return path[::-1], visited, elapsed_time
-        
-        y, x = current
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            neighbor = (ny, nx)
-            if (0 <= ny < height and 0 <= nx < width and 
-                maze[ny, nx] == 0 and neighbor not in visited):
-                stack.append(neighbor)
-                visited.add(neighbor)
-                parent[neighbor] = current
-    
-    elapsed_time = time.time() - start_time
-    return None, visited, elapsed_time
+MAX_PIXELS = 400  # Largest tile side drawn per panel
 
-# BFS Solver
-def bfs_solve(maze, start, end):
-    """Solve maze using BFS algorithm"""
-    start_time = time.time()
-    height, width = maze.shape
-    queue = deque([start])
-    visited = set([start])
-    parent = {start: None}
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    while queue:
-        current = queue.popleft()
-        if current == end:
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent[current]
-            elapsed_time = time.time() - start_time
-            return path[::-1], visited, elapsed_time
-        
-        y, x = current
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            neighbor = (ny, nx)
-            if (0 <= ny < height and 0 <= nx < width and 
-                maze[ny, nx] == 0 and neighbor not in visited):
-                queue.append(neighbor)
-                visited.add(neighbor)
-                parent[neighbor] = current
-    
-    elapsed_time = time.time() - start_time
-    return None, visited, elapsed_time
+# Visualization Function
+@st.cache_resource
+def load_plotting():
+    """Import matplotlib on first render only, once per server process"""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
+    return plt, ListedColormap(COLORS), Patch
 
-# A* Solver
-def astar_solve(maze, start, end):
-    """Solve maze using A* algorithm"""
-    start_time = time.time()
-    height, width = maze.shape
-    
-    def heuristic(pos):
-        return abs(pos[0] - end[0]) + abs(pos[1] - end[1])
-    
-    counter = 0
-    heap = [(heuristic(start), counter, start)]
-    visited = set()
-    g_score = {start: 0}
-    parent = {start: None}
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    while heap:
-        _, _, current = heapq.heappop(heap)
-        
-        if current in visited:
-            continue
-        visited.add(current)
-        
-        if current == end:
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent[current]
-            elapsed_time = time.time() - start_time
-            return path[::-1], visited, elapsed_time
-        
-        y, x = current
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            neighbor = (ny, nx)
-            
-            if (0 <= ny < height and 0 <= nx < width and 
-                maze[ny, nx] == 0 and neighbor not in visited):
-                tentative_g = g_score[current] + 1
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor)
-                    counter += 1
-                    heapq.heappush(heap, (f_score, counter, neighbor))
-                    parent[neighbor] = current
+def create_visualization(layers, window, paths, visited_cells=None, times=None, show_explored=False, pending_label="Solving..."):
+    """Create visualization of maze solutions
     
-    elapsed_time = time.time() - start_time
-    return None, visited, elapsed_time
-
-# Visualization Function
-def create_visualization(maze, start, end, paths, visited_cells=None, times=None, show_explored=False):
-    """Create visualization of maze solutions"""
+    Only the visible window is drawn, from the coarsest level that still fits
+    MAX_PIXELS, so drawing cost doesn't grow with maze size.
+    """
+    plt, cmap, Patch = load_plotting()
     fig, axes = plt.subplots(1, 3, figsize=(20, 7))
     
     algorithm_names = ['DFS', 'BFS', 'A*']
     
-    if show_explored and visited_cells:
-        colors = ['white', 'black', 'lime', 'red', 'cyan', 'yellow']
-    else:
-        colors = ['white', 'black', 'lime', 'yellow', 'red', 'cyan']
-    
-    cmap = ListedColormap(colors)
-    
     for idx, (ax, algo_name, path) in enumerate(zip(axes, algorithm_names, paths)):
-        maze_display = maze.copy().astype(float)
-        
-        # Show explored cells if enabled
-        if show_explored and visited_cells and visited_cells[idx]:
-            for y, x in visited_cells[idx]:
-                if (y, x) not in [start, end] and maze[y, x] == 0:
-                    maze_display[y, x] = 5
-        
-        # Mark solution path
-        if path:
-            for y, x in path:
-                if (y, x) not in [start, end]:
-                    maze_display[y, x] = 4
-        
-        # Mark start and end
-        maze_display[start] = 2
-        maze_display[end] = 3
-        
         # Plot
-        ax.imshow(maze_display, cmap=cmap, interpolation='nearest')
+        tile, level = render_view(layers[idx], window, show_explored, MAX_PIXELS)
+        ax.imshow(tile, cmap=cmap, vmin=0, vmax=len(COLORS) - 1, interpolation='nearest')
         
         # Title with stats
         title = f'{algo_name}'
-        if path:
+        if times and times[idx] is None:
+            title += f'\n{pending_label}'
+        elif path:
             title += f'\nPath: {len(path)} steps'
         else:
             title += f'\nNo path found'
@@ -250,6 +68,37 @@ def create_visualization(maze, start, end, paths, visited_cells=None, times=None
     
     return fig
 
+# Background jobs
+@st.cache_resource
+def get_job_queue():
+    """Worker pool shared by every session on this server"""
+    return JobQueue(max_workers=2, max_pending=8)
+
+def generate_and_solve(job, width, height, seed, multiple_solutions, extra_paths, algorithm):
+    """Job function: generate a maze, then publish each solver's result as it lands
+    
+    Display layers are built here too, so the script thread only ever slices
+    or composes a screen-sized tile. Layers are published before the result
+    they belong to.
+    """
+    job.report(progress=0.0, message="Generating maze...")
+    maze, start, end = generate_maze(width, height, seed, multiple_solutions, extra_paths, algorithm=algorithm,
+                                     progress=job.progress_callback(0.0, 0.2))
+    job.report('layers', MazeLayers(maze, start, end, max_pixels=MAX_PIXELS,
+                                    progress=job.progress_callback(0.2, 0.25)))
+    job.report('maze', (maze, start, end), progress=0.25)
+    
+    for idx, (algo_name, solver) in enumerate([('DFS', dfs_solve), ('BFS', bfs_solve), ('A*', astar_solve)]):
+        job.report(message=f"Solving with {algo_name}...")
+        stage = (idx + 1) / 4
+        result = solver(maze, start, end, return_visited=True,
+                        progress=job.progress_callback(stage, stage + 0.2))
+        job.report(('layers', idx), MazeLayers(maze, start, end, result, MAX_PIXELS,
+                                               job.progress_callback(stage + 0.2, stage + 0.25)))
+        job.report(idx, result, progress=stage + 0.25)
+    
+    job.report(message="Done")
+
 # Streamlit App
 st.title("🧩 Maze Solver: Algorithm Comparison")
 st.markdown("Compare **DFS**, **BFS**, and **A*** pathfinding algorithms visually!")
@@ -257,8 +106,20 @@ st.markdown("Compare **DFS**, **BFS**, and **A*** pathfinding algorithms visuall
 st.sidebar.header("⚙️ Maze Settings")
 
 # Settings
-width = st.sidebar.slider("Maze Width", 10, 50, 20, 5)
-height = st.sidebar.slider("Maze Height", 10, 50, 20, 5)
+width = st.sidebar.slider("Maze Width", 10, 10000, 20, 5)
+height = st.sidebar.slider("Maze Height", 10, 10000, 20, 5)
+algorithm = st.sidebar.selectbox(
+    "Generation Algorithm",
+    list(GENERATORS),
+    format_func=lambda name: name.replace('_', ' ').title(),
+    help="Binary Tree and Sidewinder are vectorized and fastest for very large mazes"
+)
+# The pure-Python carvers would hold a shared worker for minutes on huge mazes
+size_cap = SIZE_CAPS.get(algorithm)
+too_big = size_cap is not None and max(width, height) > size_cap
+if too_big:
+    st.sidebar.warning(f"⚠️ {algorithm.replace('_', ' ').title()} is limited to {size_cap}x{size_cap}. "
+                       f"Reduce the size or pick Binary Tree or Sidewinder.")
 use_seed = st.sidebar.checkbox("Use Random Seed", value=False)
 seed = None
 if use_seed:
@@ -273,24 +134,66 @@ else:
 show_explored = st.sidebar.checkbox("Show Explored Cells", value=False)
 
 st.sidebar.markdown("---")
-generate_button = st.sidebar.button("🎲 Generate & Solve New Maze", type="primary", use_container_width=True)
+generate_button = st.sidebar.button("🎲 Generate & Solve New Maze", type="primary", use_container_width=True,
+                                    disabled=too_big)
 
-# Initialize session state
-if 'maze' not in st.session_state or generate_button:
-    with st.spinner("Generating maze and solving..."):
-        maze, start, end = generate_maze(width, height, seed, multiple_solutions, extra_paths)
-        
-        # Solve with all algorithms
-        dfs_path, dfs_visited, dfs_time = dfs_solve(maze, start, end)
-        bfs_path, bfs_visited, bfs_time = bfs_solve(maze, start, end)
-        astar_path, astar_visited, astar_time = astar_solve(maze, start, end)
-        
-        st.session_state.maze = maze
-        st.session_state.start = start
-        st.session_state.end = end
-        st.session_state.paths = [dfs_path, bfs_path, astar_path]
-        st.session_state.visited = [dfs_visited, bfs_visited, astar_visited]
-        st.session_state.times = [dfs_time, bfs_time, astar_time]
+# Start a background job instead of blocking the script thread
+if (generate_button or 'job' not in st.session_state) and not too_big:
+    if 'job' in st.session_state:
+        st.session_state.job.cancel()
+    for key in ['maze', 'start', 'end', 'paths', 'visited', 'times', 'layers', 'view_center']:
+        st.session_state.pop(key, None)
+    try:
+        st.session_state.job = get_job_queue().submit(
+            generate_and_solve, width, height, seed, multiple_solutions, extra_paths, algorithm)
+    except RuntimeError as exc:
+        st.error(f"❌ {exc}")
+
+# Hand off whatever the job has published so far
+job = st.session_state.get('job')
+if job is not None:
+    if not job.done and st.sidebar.button("⏹️ Cancel", use_container_width=True):
+        job.cancel()
+    
+    results, progress, message = job.snapshot()
+    if 'maze' in results:
+        st.session_state.maze, st.session_state.start, st.session_state.end = results['maze']
+        solved = [results.get(idx) for idx in range(3)]
+        st.session_state.paths = [r.path if r else None for r in solved]
+        st.session_state.visited = [r.visited if r else None for r in solved]
+        st.session_state.times = [r.elapsed_time if r else None for r in solved]
+        # Unsolved panels show the bare maze
+        st.session_state.layers = [results[('layers', idx)] if solved[idx] else results['layers']
+                                   for idx in range(3)]
+    
+    if job.status == 'failed':
+        st.error(f"❌ Maze job failed: {job.error}")
+    elif job.status == 'cancelled':
+        st.warning("⏹️ Maze job cancelled. Generate a new maze to continue.")
+    elif not job.done:
+        st.progress(progress, text=message)
+pending_label = "Cancelled" if job is not None and job.status in ('cancelled', 'failed') else "Solving..."
+
+# Zoom and pan, for mazes bigger than a screen tile
+if 'maze' in st.session_state:
+    maze_height, maze_width = st.session_state.maze.shape
+    zoom_levels = max_zoom(st.session_state.maze.shape)
+    zoom = 0
+    center_y, center_x = st.session_state.get('view_center', (maze_height // 2, maze_width // 2))
+    if zoom_levels > 0:
+        st.sidebar.markdown("---")
+        st.sidebar.header("🔍 View")
+        zoom = st.sidebar.slider("Zoom", 0, zoom_levels, 0, help="Each step halves the visible area")
+        if zoom > 0:
+            # Pan in cells, a quarter view per step, keeping the centre across zoom changes
+            view_h, view_w = view_size(st.session_state.maze.shape, zoom)
+            step_x, step_y = pan_step(view_w), pan_step(view_h)
+            center_x = st.sidebar.slider("Pan Horizontal (column)", 0, maze_width - 1,
+                                         min(round(center_x / step_x) * step_x, maze_width - 1), step_x)
+            center_y = st.sidebar.slider("Pan Vertical (row)", 0, maze_height - 1,
+                                         min(round(center_y / step_y) * step_y, maze_height - 1), step_y)
+            st.session_state.view_center = (center_y, center_x)
+    window = view_window(st.session_state.maze.shape, zoom, center_y, center_x)
 
 # Display results
 if 'maze' in st.session_state:
@@ -298,7 +201,7 @@ if 'maze' in st.session_state:
     times = st.session_state.times
     
     # Check if solutions exist
-    if all(p is None for p in paths):
+    if all(t is not None for t in times) and all(p is None for p in paths):
         st.error("❌ No solution found! The maze might be unsolvable. Try generating a new one.")
     else:
         # Display stats
@@ -307,39 +210,43 @@ if 'maze' in st.session_state:
         with col1:
             st.metric(
                 "🔍 DFS",
-                f"{len(paths[0])} steps" if paths[0] else "No path",
-                f"{times[0]:.6f}s"
+                pending_label if times[0] is None else f"{len(paths[0])} steps" if paths[0] else "No path",
+                None if times[0] is None else f"{times[0]:.6f}s"
             )
         
         with col2:
             st.metric(
                 "📊 BFS",
-                f"{len(paths[1])} steps" if paths[1] else "No path",
-                f"{times[1]:.6f}s"
+                pending_label if times[1] is None else f"{len(paths[1])} steps" if paths[1] else "No path",
+                None if times[1] is None else f"{times[1]:.6f}s"
             )
         
         with col3:
             st.metric(
                 "⭐ A*",
-                f"{len(paths[2])} steps" if paths[2] else "No path",
-                f"{times[2]:.6f}s"
+                pending_label if times[2] is None else f"{len(paths[2])} steps" if paths[2] else "No path",
+                None if times[2] is None else f"{times[2]:.6f}s"
             )
         
         st.markdown("---")
         
         # Create and display visualization
         fig = create_visualization(
-            st.session_state.maze,
-            st.session_state.start,
-            st.session_state.end,
+            st.session_state.layers,
+            window,
             paths,
             st.session_state.visited if show_explored else None,
             times,
-            show_explored
+            show_explored,
+            pending_label
         )
         
         st.pyplot(fig)
-        plt.close()
+        load_plotting()[0].close(fig)
+        
+        y0, x0, view_h, view_w = window
+        st.caption(f"Showing rows {y0}-{y0 + view_h - 1}, columns {x0}-{x0 + view_w - 1} "
+                   f"of {st.session_state.maze.shape[0]}x{st.session_state.maze.shape[1]}")
         
         # Algorithm explanations
         with st.expander("📖 Algorithm Explanations"):
@@ -366,3 +273,8 @@ if 'maze' in st.session_state:
 
 st.sidebar.markdown("---")
 st.sidebar.info("💡 **Tip:** Enable 'Show Explored Cells' to see which cells each algorithm visited!")
+
+# Poll the running job so partial results appear as they land
+if job is not None and not job.done:
+    time.sleep(0.3)
+    st.rerun()
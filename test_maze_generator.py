@@ -0,0 +1,41 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from maze_generator import generate_maze, GENERATORS
+
+SEEDS = range(64)
+
+@pytest.mark.parametrize('algorithm', list(GENERATORS))
+def test_threaded_generation_matches_serial(algorithm):
+    """Seeded mazes built concurrently are identical to the same seeds built serially"""
+    def build(seed):
+        return generate_maze(41, 37, seed=seed, algorithm=algorithm)
+
+    serial = [build(seed) for seed in SEEDS]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        threaded = list(pool.map(build, SEEDS))
+
+    for seed, (maze, start, end), (expected, expected_start, expected_end) in zip(SEEDS, threaded, serial):
+        assert np.array_equal(maze, expected), f"seed {seed} differs when generated in a thread"
+        assert (start, end) == (expected_start, expected_end)
+
+def test_generation_leaves_global_rng_untouched():
+    """generate_maze never draws from or reseeds the global random and numpy RNGs"""
+    random.seed(1234)
+    np.random.seed(1234)
+    py_state = random.getstate()
+    np_state = np.random.get_state()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda args: generate_maze(30, 30, seed=args[0], algorithm=args[1]),
+                      [(seed, algorithm) for seed in range(8) for algorithm in GENERATORS]))
+    generate_maze(30, 30)
+
+    assert random.getstate() == py_state
+    after = np.random.get_state()
+    assert after[0] == np_state[0]
+    assert np.array_equal(after[1], np_state[1])
+    assert after[2:] == np_state[2:]
@@ -0,0 +1,12 @@
+from maze_importtime import check_import_budget, measure_import_time
+
+def test_core_modules_within_import_budget():
+    """Core modules cold-import within budget and never pull in matplotlib or streamlit"""
+    assert check_import_budget() == []
+
+def test_startup_imports_are_not_counted():
+    """Modules the interpreter loads before running any code are left out of the total"""
+    total_ms, imported = measure_import_time(['maze_result'])
+    assert 'site' not in imported
+    assert 'maze_result' in imported
+    assert total_ms >= imported['maze_result']